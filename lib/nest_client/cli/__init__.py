@@ -4,129 +4,218 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import sys
+import time
+from functools import lru_cache
+from hashlib import blake2b
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from shutil import copyfileobj
+from typing import TYPE_CHECKING, Any, Optional
 
 from ..__version__ import __author_email__, __version__  # noqa
-from ..output import Printer, Table, SimpleColumn, colored, cdiff
+from ..constants import PRINTER_FORMATS
+from ..utils import celsius_to_fahrenheit as c2f
 from .argparser import ArgParser
 from .wrapper import wrap_main
 
 if TYPE_CHECKING:
     from nest_client.client import NestWebClient
     from nest_client.entities import Schedule
+    from nest_client.output import Printer
 
 log = logging.getLogger(__name__)
-SHOW_ITEMS = ('energy', 'weather', 'buckets', 'bucket_names', 'schedule')
+TEMP_KEY_MAP = {
+    'shared': ('target_temperature_high', 'target_temperature_low', 'target_temperature', 'current_temperature'),
+    'device': ('backplate_temperature', 'leaf_threshold_cool'),
+}
+MODE_COLORS = {'COOL': 14, 'RANGE': 13}
+KEEP_STATUS_FILES = 100
+CONTROL_ACTIONS = frozenset(('temp', 'range', 'mode', 'fan'))
+LOG_FORMATTER = logging.Formatter('%(message)s')
+VERBOSE_LOG_FORMATTER = logging.Formatter('%(asctime)s %(levelname)s %(name)s %(lineno)d %(message)s')
+
+
+@lru_cache(maxsize=1)
+def parser() -> ArgParser:
+    """
+    The ArgParser for this CLI.  It is only built once per process, so the same instance is returned for every call;
+    subcommand arguments are added to it as they are needed by :meth:`ArgParser.parse_args`.
+    """
+    _parser = ArgParser(description='Nest Thermostat Manager')
+    # Subcommand arguments are only added when the subcommand is being parsed
+    _parser.add_subparser('action', 'status', 'Show current status', build=_build_status_parser)
+    _parser.add_subparser('action', 'temp', 'Set a new temperature', build=_build_temp_parser)
+    _parser.add_subparser('action', 'range', 'Set a new temperature range', build=_build_range_parser)
+    _parser.add_subparser('action', 'mode', 'Change the current mode', build=_build_mode_parser)
+    _parser.add_subparser('action', 'fan', 'Turn the fan on or off', build=_build_fan_parser)
+    _parser.add_subparser('action', 'show', 'Show information', build=_build_show_parser)
+    _parser.add_subparser('action', 'schedule', 'Update the schedule', build=_build_schedule_parser)
+    _parser.add_subparser(
+        'action', 'full_status', 'Show/save the full device+shared status', build=_build_full_status_parser
+    )
+    _parser.add_subparser('action', 'config', 'Manage configuration', build=_build_config_parser)
 
+    _parser.add_common_arg('--config', '-c', metavar='PATH', default='~/.config/nest.cfg', help='Config file location')
+    _parser.add_common_arg('--reauth', '-A', action='store_true', help='Force re-authentication, even if a cached session exists')
+    _parser.add_common_arg('--verbose', '-v', action='count', default=0, help='Increase logging verbosity (can specify multiple times)')
+    return _parser
 
-def parser():
-    _parser = ArgParser(description='Nest Thermostat Manager')
 
-    status_parser = _parser.add_subparser('action', 'status', 'Show current status')
-    status_parser.add_argument('--format', '-f', default='yaml', choices=Printer.formats, help='Output format')
+# region Subparser Builders
+
+
+def _build_status_parser(status_parser: ArgParser):
+    status_parser.add_argument('--format', '-f', default='yaml', choices=PRINTER_FORMATS, help='Output format')
     status_parser.add_argument('--details', '-d', action='store_true', help='Show more detailed information')
 
-    temp_parser = _parser.add_subparser('action', 'temp', 'Set a new temperature')
+
+def _build_temp_parser(temp_parser: ArgParser):
     temp_parser.add_argument('temp', type=float, help='The temperature to set')
     temp_parser.add_argument('--only_set', '-s', action='store_true', help='Only set the temperature - do not force it to run if the delta is < 0.5 degrees')
 
-    range_parser = _parser.add_subparser('action', 'range', 'Set a new temperature range')
+
+def _build_range_parser(range_parser: ArgParser):
     range_parser.add_argument('low', type=float, help='The low temperature to set')
     range_parser.add_argument('high', type=float, help='The high temperature to set')
 
-    mode_parser = _parser.add_subparser('action', 'mode', 'Change the current mode')
+
+def _build_mode_parser(mode_parser: ArgParser):
     mode_parser.add_argument('mode', choices=('cool', 'heat', 'range', 'off'), help='The mode to set')
 
-    fan_parser = _parser.add_subparser('action', 'fan', 'Turn the fan on or off')
+
+def _build_fan_parser(fan_parser: ArgParser):
     fan_parser.add_argument('state', choices=('on', 'off'), help='The fan state to change to')
     fan_parser.add_argument('--duration', '-d', type=int, default=1800, help='Time (in seconds) for the fan to run (ignored if setting state to off)')
 
-    show_parser = _parser.add_subparser('action', 'show', 'Show information')
+
+def _build_show_parser(show_parser: ArgParser):
     show_parser.add_argument('item', choices=SHOW_ITEMS, help='The information to show')
     show_parser.add_argument('buckets', nargs='*', help='The buckets to show (only applies to item=buckets)')
-    show_parser.add_argument('--format', '-f', choices=Printer.formats, help='Output format')
+    show_parser.add_argument('--format', '-f', choices=PRINTER_FORMATS, help='Output format')
     show_parser.add_argument('--raw', '-r', action='store_true', help='Show the full raw response instead of the processed response (only applies to item=buckets)')
 
-    with _parser.add_subparser('action', 'schedule', 'Update the schedule') as schd_parser:
-        schd_add = schd_parser.add_subparser('sub_action', 'add', 'Add entries with the specified schedule')
-        schd_add.add_argument('cron', help='Cron-format schedule to use')
-        schd_add.add_argument('temp', type=float, help='The temperature to set at the specified time')
-        schd_add.add_argument('--unit', '-u', choices=('f', 'c'), help='Input unit (default: from config)')
 
-        schd_rem = schd_parser.add_subparser('sub_action', 'remove', 'Remove entries with the specified schedule')
-        schd_rem.add_argument('cron', help='Cron-format schedule to use')
-        schd_rem.add_constant('temp', None)
-        schd_rem.add_constant('unit', None)
+def _build_schedule_parser(schd_parser: ArgParser):
+    schd_add = schd_parser.add_subparser('sub_action', 'add', 'Add entries with the specified schedule')
+    schd_add.add_argument('cron', help='Cron-format schedule to use')
+    schd_add.add_argument('temp', type=float, help='The temperature to set at the specified time')
+    schd_add.add_argument('--unit', '-u', choices=('f', 'c'), help='Input unit (default: from config)')
+
+    schd_rem = schd_parser.add_subparser('sub_action', 'remove', 'Remove entries with the specified schedule')
+    schd_rem.add_argument('cron', help='Cron-format schedule to use')
+    schd_rem.add_constant('temp', None)
+    schd_rem.add_constant('unit', None)
 
-        schd_save = schd_parser.add_subparser('sub_action', 'save', 'Save the current schedule to a file')
-        schd_save.add_argument('path', help='The path to a file in which the current schedule should be saved')
-        schd_save.add_argument('--overwrite', '-W', action='store_true', help='Overwrite the file if it already exists')
+    schd_save = schd_parser.add_subparser('sub_action', 'save', 'Save the current schedule to a file')
+    schd_save.add_argument('path', help='The path to a file in which the current schedule should be saved')
+    schd_save.add_argument('--overwrite', '-W', action='store_true', help='Overwrite the file if it already exists')
 
-        schd_load = schd_parser.add_subparser('sub_action', 'load', 'Load a schedule from a file')
-        schd_load.add_argument('path', help='The path to a file containing the schedule that should be loaded')
-        schd_load.add_argument('--force', '-F', action='store_true', help='Force the schedule to be pushed, even if it matches the current schedule')
+    schd_load = schd_parser.add_subparser('sub_action', 'load', 'Load a schedule from a file')
+    schd_load.add_argument('path', help='The path to a file containing the schedule that should be loaded')
+    schd_load.add_argument('--force', '-F', action='store_true', help='Force the schedule to be pushed, even if it matches the current schedule')
 
-        schd_show = schd_parser.add_subparser('sub_action', 'show', 'Show the current schedule')
-        schd_show.add_argument('--format', '-f', choices=Printer.formats, help='Output format')
-        schd_show.add_argument('--raw', '-r', action='count', default=0, help='Show the schedule in the Nest format instead of readable')
-        schd_show.add_argument('--unit', '-u', choices=('f', 'c'), help='Display unit (default: from config)')
+    schd_show = schd_parser.add_subparser('sub_action', 'show', 'Show the current schedule')
+    schd_show.add_argument('--format', '-f', choices=PRINTER_FORMATS, help='Output format')
+    schd_show.add_argument('--raw', '-r', action='count', default=0, help='Show the schedule in the Nest format instead of readable')
+    schd_show.add_argument('--unit', '-u', choices=('f', 'c'), help='Display unit (default: from config)')
 
-        schd_parser.add_common_arg('--dry_run', '-D', action='store_true', help='Print actions that would be taken instead of taking them')
+    schd_parser.add_common_arg('--dry_run', '-D', action='store_true', help='Print actions that would be taken instead of taking them')
 
-    full_status_parser = _parser.add_subparser('action', 'full_status', 'Show/save the full device+shared status')
+
+def _build_full_status_parser(full_status_parser: ArgParser):
     full_status_parser.add_argument('--path', '-p', help='Location to store status info')
     full_status_parser.add_argument('--diff', '-d', action='store_true', help='Print a diff of the current status compared to the previous most recent status')
 
-    cfg_parser = _parser.add_subparser('action', 'config', 'Manage configuration')
-    cfg_show_parser = cfg_parser.add_subparser('sub_action', 'show', 'Show the config file contents')
+
+def _build_config_parser(cfg_parser: ArgParser):
+    cfg_parser.add_subparser('sub_action', 'show', 'Show the config file contents')
     cfg_set_parser = cfg_parser.add_subparser('sub_action', 'set', 'Set configs')
     cfg_set_parser.add_argument('section', choices=('credentials', 'device', 'oauth', 'units'), help='The section to modify')
     cfg_set_parser.add_argument('key', help='The key within the specified section to modify')
     cfg_set_parser.add_argument('value', help='The new value for the specified section and key')
 
-    _parser.add_common_arg('--config', '-c', metavar='PATH', default='~/.config/nest.cfg', help='Config file location')
-    _parser.add_common_arg('--reauth', '-A', action='store_true', help='Force re-authentication, even if a cached session exists')
-    _parser.add_common_arg('--verbose', '-v', action='count', default=0, help='Increase logging verbosity (can specify multiple times)')
-    return _parser
 
+# endregion
 
-@wrap_main
-async def main():
+
+def main():
+    # Arguments are parsed before wrap_main starts an event loop, so --help / usage errors exit without creating one
     args = parser().parse_args()
-    log_fmt = '%(asctime)s %(levelname)s %(name)s %(lineno)d %(message)s' if args.verbose else '%(message)s'
-    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format=log_fmt)
-    logging.getLogger('httpx').setLevel(logging.WARNING)
+    _init_logging(args.verbose)
+    _main(args)
 
+
+@wrap_main
+async def _main(args):
     from nest_client.client import NestWebClient
 
     async with NestWebClient(args.config, args.reauth) as nest:
-        if (action := args.action) == 'status':
-            await show_status(nest, args.details, args.format)
-        elif action in {'temp', 'range', 'mode', 'fan'}:
+        if (action := args.action) in CONTROL_ACTIONS:
             await control_thermostat(nest, action, args)
-        elif action == 'show':
-            await show_item(nest, args.item, args.format, args.buckets, args.raw)
-        elif action == 'schedule':
-            await manage_schedule(nest, args.sub_action, args)
-        elif action == 'full_status':
-            await show_full_status(nest, args.path, args.diff)
-        elif action == 'config':
-            if args.sub_action == 'show':
-                log.warning(
-                    'WARNING: The [oauth] section contains credentials that should be kept secret - do not share this'
-                    ' output with anyone\n',
-                    extra={'color': 'red'},
-                )
-                with nest.config.path.open('r') as f:
-                    print(f.read())
-            elif args.sub_action == 'set':
-                nest.config.maybe_set(args.section, args.key, args.value)
-            else:
-                raise ValueError(f'Unexpected config sub-action={args.sub_action!r}')
         else:
-            raise ValueError(f'Unexpected {action=!r}')
+            try:
+                action_func = ACTION_FUNCS[action]
+            except KeyError:
+                raise ValueError(f'Unexpected {action=!r}') from None
+            await action_func(nest, args)
+
+
+def _init_logging(verbose: int):
+    root = logging.getLogger()
+    if not root.handlers:  # Like basicConfig, do nothing if logging was already configured
+        handler = logging.StreamHandler()
+        handler.setFormatter(VERBOSE_LOG_FORMATTER if verbose else LOG_FORMATTER)
+        root.addHandler(handler)
+        root.setLevel(logging.DEBUG if verbose else logging.INFO)
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+
+
+# region Action Handlers
+
+
+async def _status(nest: NestWebClient, args):
+    await show_status(nest, args.details, args.format)
+
+
+async def _show(nest: NestWebClient, args):
+    await show_item(nest, args.item, args.format, args.buckets, args.raw)
+
+
+async def _schedule(nest: NestWebClient, args):
+    await manage_schedule(nest, args.sub_action, args)
+
+
+async def _full_status(nest: NestWebClient, args):
+    await show_full_status(nest, args.path, args.diff)
+
+
+async def _config(nest: NestWebClient, args):
+    if args.sub_action == 'show':
+        log.warning(
+            'WARNING: The [oauth] section contains credentials that should be kept secret - do not share this'
+            ' output with anyone\n',
+            extra={'color': 'red'},
+        )
+        with nest.config.path.open('r') as f:
+            copyfileobj(f, sys.stdout)
+        print()
+    elif args.sub_action == 'set':
+        nest.config.maybe_set(args.section, args.key, args.value)
+    else:
+        raise ValueError(f'Unexpected config sub-action={args.sub_action!r}')
+
+
+ACTION_FUNCS = {
+    'status': _status,
+    'show': _show,
+    'schedule': _schedule,
+    'full_status': _full_status,
+    'config': _config,
+}
+
+# endregion
 
 
 async def manage_schedule(nest: NestWebClient, action: str, args):
@@ -173,20 +262,22 @@ async def control_thermostat(nest: NestWebClient, action: str, args):
             raise ValueError(f'Unexpected {action=}')
 
 
-def _convert_temp_values(status: dict[str, dict[str, Any]]):
-    from nest_client.utils import celsius_to_fahrenheit as c2f
+@lru_cache(maxsize=len(PRINTER_FORMATS))
+def _printer(output_format: str) -> Printer:
+    from nest_client.output import Printer
+
+    return Printer(output_format)
 
-    temp_key_map = {
-        'shared': ('target_temperature_high', 'target_temperature_low', 'target_temperature', 'current_temperature'),
-        'device': ('backplate_temperature', 'leaf_threshold_cool'),
-    }
-    for section, keys in temp_key_map.items():
-        for key in keys:
-            status[section][key] = c2f(status[section][key])
+
+def _convert_temp_values(status: dict[str, dict[str, Any]]):
+    for section, keys in TEMP_KEY_MAP.items():
+        section_status = status[section]
+        section_status.update({key: c2f(section_status[key]) for key in keys})
 
 
 async def show_status(nest: NestWebClient, details: bool, out_fmt: str):
     from nest_client.entities import ThermostatDevice
+    from nest_client.output import Table, SimpleColumn, colored
 
     device = await ThermostatDevice.find(nest)
     if details:
@@ -194,34 +285,45 @@ async def show_status(nest: NestWebClient, details: bool, out_fmt: str):
         status = {'device': device.value, 'shared': shared.value}
         if nest.config.temp_unit == 'f':
             _convert_temp_values(status)
-        Printer(out_fmt).pprint(status)
+        _printer(out_fmt).pprint(status)
     else:
         mode = device.schedule_mode.upper()
-        tbl = Table(
-            SimpleColumn('Humidity'),
-            SimpleColumn('Mode', len(mode)),
-            SimpleColumn('Fan', 7),
-            SimpleColumn('Target', display=mode != 'RANGE'),
-            SimpleColumn('Target (low)', display=mode == 'RANGE'),
-            SimpleColumn('Target (high)', display=mode == 'RANGE'),
-            SimpleColumn('Temperature'),
-            fix_ansi_width=True,
-        )
-
         shared = await device.get_shared()
         current = shared.current_temperature
-        target = shared.target_temperature
-        target_lo, target_hi = shared.target_temp_range
         status_table = {
-            'Mode': colored(mode, 14 if mode == 'COOL' else 13 if mode == 'RANGE' else 9),
+            'Mode': colored(mode, MODE_COLORS.get(mode, 9)),
             'Humidity': device.humidity,
             'Temperature': colored(f'{current:>11.1f}', 11),
             'Fan': colored('RUNNING', 10) if shared.running else colored('OFF', 8),
-            'Target (low)': colored(f'{target_lo:>12.1f}', 14 if target_lo < current else 9),
-            'Target (high)': colored(f'{target_hi:>13.1f}', 14 if target_hi < current else 9),
-            'Target': colored(f'{target:>6.1f}', 14 if target < current else 9),
         }
-        tbl.print_rows([status_table])
+        if mode == 'RANGE':
+            target_lo, target_hi = shared.target_temp_range
+            status_table['Target (low)'] = colored(f'{target_lo:>12.1f}', _target_color(target_lo, current))
+            status_table['Target (high)'] = colored(f'{target_hi:>13.1f}', _target_color(target_hi, current))
+        else:
+            target = shared.target_temperature
+            status_table['Target'] = colored(f'{target:>6.1f}', _target_color(target, current))
+        # The Table is built per call since it binds to the current sys.stdout; only the column specs are cached
+        Table(*(SimpleColumn(*spec) for spec in _status_columns(mode)), fix_ansi_width=True).print_rows([status_table])
+
+
+@lru_cache(maxsize=4)
+def _status_columns(mode: str) -> tuple[tuple[str, int, bool], ...]:
+    """(title, width, display) args for each status table :class:`SimpleColumn<nest_client.output.SimpleColumn>`"""
+    is_range = mode == 'RANGE'
+    return (
+        ('Humidity', 0, True),
+        ('Mode', len(mode), True),
+        ('Fan', 7, True),
+        ('Target', 0, not is_range),
+        ('Target (low)', 0, is_range),
+        ('Target (high)', 0, is_range),
+        ('Temperature', 0, True),
+    )
+
+
+def _target_color(target: float, current: float) -> int:
+    return 14 if target < current else 9
 
 
 async def show_item(nest: NestWebClient, item: str, out_fmt: str = None, buckets=None, raw: bool = False):
@@ -229,38 +331,103 @@ async def show_item(nest: NestWebClient, item: str, out_fmt: str = None, buckets
         schedule = await nest.get_object('schedule')  # type: Schedule
         schedule.weekly_schedule.print(out_fmt or ('raw' if raw else 'table'), raw)
     else:
-        if item == 'energy':
-            data = (await nest.get_object('energy_latest')).value
-        elif item == 'weather':
-            data = await nest.get_weather()
-        elif item == 'buckets':
-            data = await nest.app_launch(buckets)
-            if not raw:
-                data = data['updated_buckets']
-        elif item == 'bucket_names':
-            bucket = await nest.get_object('buckets')
-            data = {obj.type: names for obj, names in (await bucket.types_by_parent()).items()}
-        else:
-            raise ValueError(f'Unexpected {item=!r}')
+        try:
+            get_item_data = SHOW_ITEM_FUNCS[item]
+        except KeyError:
+            raise ValueError(f'Unexpected {item=!r}') from None
+        data = await get_item_data(nest, buckets, raw)
+        _printer(out_fmt or 'yaml').pprint(data)
+
+
+async def _get_energy(nest: NestWebClient, buckets=None, raw: bool = False):
+    return (await nest.get_object('energy_latest')).value
+
+
+async def _get_weather(nest: NestWebClient, buckets=None, raw: bool = False):
+    return await nest.get_weather()
+
+
+async def _get_buckets(nest: NestWebClient, buckets=None, raw: bool = False):
+    data = await nest.app_launch(buckets)
+    return data if raw else data['updated_buckets']
 
-        Printer(out_fmt or 'yaml').pprint(data)
+
+async def _get_bucket_names(nest: NestWebClient, buckets=None, raw: bool = False):
+    bucket = await nest.get_object('buckets')
+    return {obj.type: names for obj, names in (await bucket.types_by_parent()).items()}
+
+
+SHOW_ITEM_FUNCS = {
+    'energy': _get_energy,
+    'weather': _get_weather,
+    'buckets': _get_buckets,
+    'bucket_names': _get_bucket_names,
+}
+SHOW_ITEMS = (*SHOW_ITEM_FUNCS, 'schedule')  # schedule is handled separately since it is not printed via Printer
 
 
 async def show_full_status(nest, path: str = None, diff: bool = False):
-    import json
-    import time
-    path = Path(path or '~/etc/nest/status').expanduser()
-    if path.exists() and not path.is_dir():
-        raise ValueError(f'Invalid {path=} - it must be a directory')
-    elif not path.exists():
-        path.mkdir(parents=True)
+    from nest_client.output import cdiff_text
 
+    path = _status_dir(path)
     data = await nest.app_launch(['device', 'shared'])
-    status_path = path.joinpath(f'status_{int(time.time())}.json')
-    log.info(f'Saving status to {status_path.as_posix()}')
-    with status_path.open('w', encoding='utf-8', newline='\n') as f:
-        json.dump(data, f, indent=4, sort_keys=True)
+    payload = _serialize_status(data)
+    digest = blake2b(payload, digest_size=8).hexdigest()
+    existing = _status_paths(path)
+    latest = existing[-1] if existing else None
+    if latest is not None and latest.stem.endswith(f'_{digest}'):
+        log.info(f'Status is unchanged since {latest.as_posix()} - skipping save')
+        status_path = latest
+    else:
+        status_path = path.joinpath(f'status_{time.time_ns()}_{digest}.json')
+        log.info(f'Saving status to {status_path.as_posix()}')
+        status_path.write_bytes(payload)
+        existing.append(status_path)
+        for old_path in existing[:-KEEP_STATUS_FILES]:
+            log.debug(f'Deleting old status file: {old_path.as_posix()}')
+            old_path.unlink()
 
     if diff:
-        latest = max((p for p in path.iterdir() if p != status_path), key=lambda p: p.stat().st_mtime)
-        cdiff(latest.as_posix(), status_path.as_posix())
+        if latest is None:
+            log.warning(f'No previous status was found in {path.as_posix()} to compare against')
+        elif latest != status_path:  # Otherwise, the content is identical
+            cdiff_text(latest.as_posix(), payload.decode('utf-8'), status_path.as_posix())
+
+
+@lru_cache(maxsize=None)
+def _status_dir(path: str = None) -> Path:
+    """The status directory for the given path, which is only expanded and created once per process"""
+    path = Path(path or '~/etc/nest/status').expanduser()
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+    except FileExistsError:  # It exists, but is not a directory
+        raise ValueError(f'Invalid {path=} - it must be a directory') from None
+    return path
+
+
+def _serialize_status(data: dict[str, Any]) -> bytes:
+    # Always uses the stdlib json module, so the saved format (and the digest used to skip unchanged snapshots) does not
+    # depend on whether the optional orjson extra is installed; this matches the format of existing status files
+    return json.dumps(data, indent=4, sort_keys=True).encode('utf-8')
+
+
+def _status_paths(path: Path) -> list[Path]:
+    """
+    The status files in the given directory, sorted from oldest to newest by the timestamps in their names.  Files whose
+    names do not contain a timestamp (such as a manually saved ``status_backup.json``) are ignored, so they are never
+    compared against or deleted.
+    """
+    timed_paths = []
+    for status_path in path.iterdir():
+        if status_path.name.startswith('status_') and status_path.suffix == '.json':
+            if (timestamp := _status_file_time(status_path)) is not None:
+                timed_paths.append((timestamp, status_path))
+    return [status_path for _, status_path in sorted(timed_paths)]
+
+
+def _status_file_time(path: Path) -> Optional[int]:
+    # Older files used seconds instead of nanoseconds, which still sorts them before newer files
+    try:
+        return int(path.stem.split('_', 2)[1])
+    except (IndexError, ValueError):
+        return None
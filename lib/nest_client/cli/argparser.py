@@ -2,14 +2,18 @@
 :author: Doug Skrypa
 """
 
+import sys
 from argparse import ArgumentParser
 from contextlib import suppress
+from typing import Callable, Any
 
 
 class ArgParser(ArgumentParser):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.__constants = {}
+        self.__common_args = []
+        self.__builders = {}
 
     def add_constant(self, key, value):
         self.__constants[key] = value
@@ -20,7 +24,14 @@ class ArgParser(ArgumentParser):
         except AttributeError:  # If no subparsers exist yet
             return None
 
-    def add_subparser(self, dest: str, name: str, help_desc: str = None, **kwargs) -> 'ArgParser':
+    def add_subparser(
+        self,
+        dest: str,
+        name: str,
+        help_desc: str = None,
+        build: Callable[['ArgParser'], Any] = None,
+        **kwargs,
+    ) -> 'ArgParser':
         """
         Add a subparser for a subcommand to the subparser group with the given destination variable name.  Creates the
         group if it does not already exist.
@@ -28,6 +39,8 @@ class ArgParser(ArgumentParser):
         :param dest: The subparser group destination for this subparser
         :param name: The name of the subcommand/subparser to add
         :param help_desc: The text to be used as both the help and description for this subcommand
+        :param build: A callable that accepts the new subparser and adds its arguments.  If provided, it will only be
+          called when parsing arguments that include this subcommand's name
         :param kwargs: Keyword args to pass to the :func:`add_parser` function
         :return: The parser that was created
         """
@@ -35,10 +48,23 @@ class ArgParser(ArgumentParser):
         sub_parser = sp_group.add_parser(
             name, help=kwargs.pop('help', help_desc), description=kwargs.pop('description', help_desc), **kwargs
         )
+        if build is not None:
+            self.__builders[name] = (sub_parser, build)
         return sub_parser  # noqa
 
-    def parse_args(self, *args, **kwargs):
-        args = super().parse_args(*args, **kwargs)
+    def _build_subparsers(self, argv: list[str]):
+        """Call the deferred builders for any subparsers whose names are present in the given arguments"""
+        for name in [name for name in self.__builders if name in argv]:
+            sub_parser, build = self.__builders.pop(name)
+            inherited = list(sub_parser.__common_args)
+            build(sub_parser)
+            for args, kwargs in inherited:  # Common args added before building would have missed new subparsers
+                sub_parser._add_arg_to_subparsers(args, kwargs)
+            sub_parser._build_subparsers(argv)
+
+    def parse_args(self, args=None, namespace=None):
+        self._build_subparsers(sys.argv[1:] if args is None else args)
+        args = super().parse_args(args, namespace)
         with suppress(AttributeError):
             if missing := next((sp for sp in self._subparsers._group_actions if getattr(args, sp.dest) is None), None):
                 self.error(f'missing required positional argument: {missing.dest} (use --help for more details)')
@@ -68,6 +94,7 @@ class ArgParser(ArgumentParser):
     def add_common_arg(self, *args, **kwargs):
         """Add an argument with the given parameters to this ArgParser and every subparser in it"""
         self.add_argument(*args, **kwargs)
+        self.__common_args.append((args, kwargs))
         if subparsers := self.get_subparsers():
             self._add_arg_to_subparsers(args, kwargs, subparsers)
 
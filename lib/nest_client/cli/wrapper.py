@@ -48,11 +48,16 @@ def wrap_main(main):
             pass
         except Exception as e:
             import traceback
+            debug_str = getattr(e, 'debug_str', None)   # e.g., ConfigError includes the environment variables
             if _logger_has_non_null_handlers(log):
                 log.log(19, traceback.format_exc())     # hide tb since exc may be expected unless output is --verbose
+                if debug_str is not None:
+                    log.log(19, debug_str())
                 log.error(e)
             else:               # If logging wasn't configured, or the error occurred before logging could be configured
                 print(traceback.format_exc(), file=sys.stderr)
+                if debug_str is not None:
+                    print(debug_str(), file=sys.stderr)
             sys.exit(1)
         finally:
             """
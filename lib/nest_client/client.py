@@ -6,16 +6,22 @@ Library for interacting with the Nest thermostat via the web API
 
 import json
 import logging
-import pickle
 import time
-from asyncio import Lock, get_running_loop, gather
-from contextlib import asynccontextmanager
+from asyncio import Lock, Task, create_task, shield, to_thread
+from collections import defaultdict
+from contextlib import asynccontextmanager, suppress
+from functools import lru_cache, partial
 from datetime import datetime
+from http.cookiejar import Cookie
 from typing import Union, Optional, Mapping, Iterable, Any, AsyncContextManager
 from urllib.parse import urlparse
 from zoneinfo import ZoneInfo
 
-from httpx import HTTPError, TimeoutException, HTTPStatusError
+from httpx import HTTPError, TimeoutException, HTTPStatusError, Response
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 from requests_client.async_client import AsyncRequestsClient
 from requests_client.user_agent import USER_AGENT_CHROME
@@ -32,9 +38,18 @@ from .entities.user import User
 __all__ = ['NestWebClient']
 log = logging.getLogger(__name__)
 UTC = ZoneInfo('UTC')
+DEVICE_TYPES = frozenset(('device', *Device.child_types))  # Types that default to the configured device serial
+_COOKIE_ATTRS = (
+    'version', 'name', 'value', 'port', 'port_specified', 'domain', 'domain_specified', 'domain_initial_dot', 'path',
+    'path_specified', 'secure', 'expires', 'discard', 'comment', 'comment_url', 'rfc2109',
+)
 
 
 class NestWebClient:
+    __slots__ = (
+        'config', '_client', 'auth', '_known_objects', '_known_by_type', '_transport_host_port', '_latest_weather',
+        '_weather_location', '_last_known_reauth', '_user_id', '_app_launch_tasks',
+    )
     _nest_host_port = ('home.nest.com', None)
 
     def __init__(self, config_path: str = None, reauth: bool = False, overrides: Mapping[str, Optional[str]] = None):
@@ -44,10 +59,13 @@ class NestWebClient:
         )
         self.auth = NestWebAuth(self.config, self._client, reauth)
         self._known_objects: dict[str, NestObj] = {}
-        self._latest_transport_url = None
+        self._known_by_type: defaultdict[str, dict[str, NestObj]] = defaultdict(dict)
+        self._transport_host_port: Optional[tuple[str, Optional[int]]] = None
         self._latest_weather = None
-        self._last_known_reauth = datetime.now()
+        self._weather_location = None
+        self._last_known_reauth = time.monotonic()
         self._user_id = None
+        self._app_launch_tasks: dict[tuple[frozenset[str], Optional[float]], Task] = {}
 
     async def user_id(self) -> str:
         if self._user_id is None:
@@ -58,7 +76,9 @@ class NestWebClient:
 
     @asynccontextmanager
     async def transport_url(self) -> AsyncContextManager[AsyncRequestsClient]:
-        host, port = await self._transport_host_port()  # Must be outside `with` to prevent deadlock if update is needed
+        if self._needs_transport_url_update():  # Must be outside `with` to prevent deadlock
+            await self.app_launch()
+        host, port = self._transport_host_port
         async with self.auth:
             log.debug(f'Using host:port={host}:{port}')
             self._client.host, self._client.port = host, port
@@ -72,20 +92,28 @@ class NestWebClient:
             self._client.host, self._client.port = host, port
             yield self._client
 
-    async def _transport_host_port(self) -> tuple[str, Optional[int]]:
-        if self._needs_transport_url_update():
-            await self.app_launch()
-        return self._latest_transport_url.hostname, self._latest_transport_url.port
-
     def _needs_transport_url_update(self) -> bool:
-        return self._latest_transport_url is None or self.auth.last_reauth > self._last_known_reauth
+        return self._transport_host_port is None or self.auth.last_reauth > self._last_known_reauth
 
     # endregion
 
     # region Low Level Methods
 
     async def app_launch(self, bucket_types: Iterable[str] = None, timeout: float = None) -> dict[str, Any]:
-        bucket_types = list(bucket_types) if bucket_types else []
+        # Concurrent requests for the same bucket types and timeout share a single in-flight request
+        key = (frozenset(bucket_types or ()), timeout)
+        if (task := self._app_launch_tasks.get(key)) is None:
+            self._app_launch_tasks[key] = task = create_task(self._app_launch(sorted(key[0]), timeout))
+            task.add_done_callback(partial(self._app_launch_done, key))
+        return await shield(task)
+
+    def _app_launch_done(self, key: tuple[frozenset[str], Optional[float]], task: Task):
+        self._app_launch_tasks.pop(key, None)
+        if not task.cancelled():
+            # Waiters receive any error via shield, but if all of them were cancelled, nothing else would retrieve it
+            task.exception()
+
+    async def _app_launch(self, bucket_types: list[str], timeout: float = None) -> dict[str, Any]:
         payload = {'known_bucket_types': bucket_types, 'known_bucket_versions': []}
         async with self.nest_url() as client:
             user_id = await self.user_id()
@@ -96,10 +124,12 @@ class NestWebClient:
                     self.auth.force_reauth = True
                 raise
 
-            data = resp.json()
+            data = _loads(resp)
             if self._needs_transport_url_update():
                 self._latest_weather = data['weather_for_structures']
-                self._latest_transport_url = urlparse(data['service_urls']['urls']['transport_url'])
+                self._weather_location = None
+                transport_url = urlparse(data['service_urls']['urls']['transport_url'])
+                self._transport_host_port = (transport_url.hostname, transport_url.port)
                 self._last_known_reauth = self.auth.last_reauth
             return data
 
@@ -112,13 +142,15 @@ class NestWebClient:
         async with self.transport_url() as client:
             user_id = await self.user_id()
             resp = await client.get(f'v2/mobile/user.{user_id}')
-            return resp.json()
+            return _loads(resp)
 
     async def get_weather_location(self) -> tuple[str, str]:
-        if self._latest_weather is None:
-            await self.app_launch()
-        location = next(iter(self._latest_weather.values()))['location']
-        return location['zip'], location['country']
+        if self._weather_location is None:
+            if self._latest_weather is None:
+                await self.app_launch()
+            location = next(iter(self._latest_weather.values()))['location']
+            self._weather_location = (location['zip'], location['country'])
+        return self._weather_location
 
     async def get_weather(self, zip_code: Union[str, int] = None, country_code: str = None) -> dict[str, Any]:
         """
@@ -148,18 +180,17 @@ class NestWebClient:
         country_code = country_code or 'US'
         async with self.nest_url() as client:
             resp = await client.get(f'api/0.1/weather/forecast/{zip_code},{country_code}')
-            return resp.json()
+            return _loads(resp)
 
     # endregion
 
     # region High Level Object Methods
 
     async def get_objects(self, types: Iterable[str], cached: bool = True, children: bool = True) -> dict[str, NestObj]:
-        types = set(types)
-        if cached and (obj_dict := {k: v for k, v in self._known_objects.items() if v.type in types}):
-            found_types = {obj.type for obj in obj_dict.values()}
-            if missing := types.difference(found_types):
-                log.debug(f'Found={found_types} requested={types} - retrieving {missing=}')
+        types = frozenset(types)
+        if cached and (obj_dict := self._get_known_objects(types)):
+            if missing := {obj_type for obj_type in types if obj_type not in self._known_by_type}:
+                log.debug(f'Found={types - missing} requested={types} - retrieving {missing=}')
                 obj_dict.update(await self.get_objects(missing, False))
             return obj_dict
 
@@ -168,9 +199,11 @@ class NestWebClient:
             types = _expand_with_children(types)
 
         log.debug(f'Requesting buckets for {types=}')
-        obj_dict = {obj['object_key']: NestObject.from_dict(obj, self) for obj in (await self.get_buckets(types))}
-        log.debug('Found new objects: ' + ', '.join(sorted(obj_dict)))
-        self._known_objects.update(obj_dict)
+        from_dict = NestObject.from_dict
+        obj_dict = {obj['object_key']: from_dict(obj, self) for obj in (await self.get_buckets(types))}
+        if log.isEnabledFor(logging.DEBUG):  # Avoid sorting/joining keys that would not be logged
+            log.debug('Found new objects: ' + ', '.join(sorted(obj_dict)))
+        self._add_known_objects(obj_dict)
         if children and orig_types != types:
             obj_dict = {key: obj for key, obj in obj_dict.items() if obj.type in orig_types}
         return obj_dict
@@ -194,7 +227,7 @@ class NestWebClient:
     def _get_object(
         self, obj_dict: dict[str, NestObj], type: str, serial: str = None, _sub_type_key: str = None  # noqa
     ) -> NestObj:
-        if not serial and (type == 'device' or type in Device.child_types):
+        if not serial and type in DEVICE_TYPES:
             serial = self.config.serial
         if serial:
             object_key = f'{type}.{serial}'
@@ -220,6 +253,18 @@ class NestWebClient:
                 else:
                     raise ValueError(f'A serial number is required - found {ko_count} {desc} objects: {list(obj_dict)}')
 
+    def _get_known_objects(self, types: Iterable[str]) -> dict[str, NestObj]:
+        obj_dict = {}
+        for obj_type in types:
+            if type_objs := self._known_by_type.get(obj_type):
+                obj_dict.update(type_objs)
+        return obj_dict
+
+    def _add_known_objects(self, obj_dict: dict[str, NestObj]):
+        self._known_objects.update(obj_dict)
+        for key, obj in obj_dict.items():
+            self._known_by_type[obj.type][key] = obj
+
     async def get_init_objects(self, cached: bool = False) -> dict[str, NestObj]:
         return await self.get_objects(INIT_BUCKET_TYPES, cached)
 
@@ -266,7 +311,7 @@ class NestWebClient:
         log.debug(f'Submitting subscribe request with {payload=}')
         async with self.transport_url() as client:
             resp = await client.post('v5/subscribe', json=payload, timeout=timeout)
-            return resp.json()['objects']
+            return _loads(resp)['objects']
 
     async def refresh_known_objects(self, subscribe: bool = True, send_meta: bool = True, timeout: float = None):
         await self.refresh_objects(self._known_objects.values(), subscribe, send_meta, timeout=timeout)
@@ -284,11 +329,10 @@ class NestWebClient:
             if subscribe:
                 objects = set(objects)
                 if children:
-                    children_groups = await gather(*(obj.get_children() for obj in objects))
-                    objects.update(c for group in children_groups for c in group.values())
+                    objects.update(await self._get_children(objects))
                 raw_objs = await self.subscribe(objects, send_meta, timeout or 5)
             else:
-                types = {obj.type for obj in objects}
+                types = frozenset(obj.type for obj in objects)
                 raw_objs = await self.get_buckets(_expand_with_children(types) if children else types, timeout=timeout)
         except TimeoutException:
             log.debug('Refresh subscribe request timed out')
@@ -306,13 +350,22 @@ class NestWebClient:
         except HTTPError as e:
             log.debug(f'Refresh failed due to error: {e}')
         else:
-            for raw_obj in raw_objs:
-                key = raw_obj['object_key']
-                if obj := self._known_objects.get(key):
-                    obj._refresh(raw_obj)
-                else:
-                    self._known_objects[key] = obj = NestObject.from_dict(raw_obj, self)
-                    log.debug(f'Found new {obj=} during refresh')
+            raw_by_key = {raw_obj['object_key']: raw_obj for raw_obj in raw_objs}
+            known = self._known_objects
+            for key in raw_by_key.keys() & known.keys():
+                known[key]._refresh(raw_by_key[key])
+            if new_keys := raw_by_key.keys() - known.keys():
+                from_dict = NestObject.from_dict
+                self._add_known_objects({key: from_dict(raw_by_key[key], self) for key in new_keys})
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug('Found new objects during refresh: ' + ', '.join(sorted(new_keys)))
+
+    async def _get_children(self, objects: Iterable[NestObj]) -> list[NestObj]:
+        """Equivalent to calling :meth:`NestObject.get_children` for each object, but with a single lookup"""
+        if not (child_keys := {(c_type, obj.serial) for obj in objects for c_type in obj.fetch_child_types}):
+            return []
+        known = await self.get_objects({c_type for c_type, _ in child_keys})
+        return [obj for obj in known.values() if (obj.type, obj.serial) in child_keys]
 
     # endregion
 
@@ -327,15 +380,20 @@ class NestWebClient:
 
 
 class NestWebAuth:
+    __slots__ = (
+        '_client', 'config', 'cache_path', 'force_reauth', 'last_reauth', 'expiry', '_expiry_ts', '_lock', '_user_id'
+    )
+
     def __init__(self, config: NestConfig, client: AsyncRequestsClient, force_reauth: bool = False):
         self._client = client
         self.config = config
         if 'oauth' not in self.config:
             raise ConfigError(self.config, 'Missing required oauth configs')
-        self.cache_path = get_user_cache_dir('nest').joinpath('session.pickle')
+        self.cache_path = get_user_cache_dir('nest').joinpath('session.json')
         self.force_reauth = force_reauth
         self.last_reauth = None
         self.expiry = None
+        self._expiry_ts = None
         self._lock = Lock()
         self._user_id = None
 
@@ -345,7 +403,7 @@ class NestWebAuth:
         return self._user_id
 
     def needs_login_refresh(self) -> bool:
-        return self.force_reauth or self.expiry is None or self.expiry < datetime.utcnow()
+        return self.force_reauth or self._expiry_ts is None or self._expiry_ts < time.time()
 
     async def maybe_refresh_login(self):
         if self.needs_login_refresh():
@@ -355,51 +413,58 @@ class NestWebAuth:
                 log.debug(e)
                 await self._login_via_google()
                 self.force_reauth = False
-            self.last_reauth = datetime.now()
+            self.last_reauth = time.monotonic()
 
     def _read_cache_file(self):
-        with self.cache_path.open('rb') as f:
-            try:
-                expiry, userid, jwt_token, cookies = pickle.load(f)
-            except (TypeError, ValueError) as e:
-                raise SessionExpired(f'Found a cached session, but encountered an error loading it: {e}')
-        return expiry, userid, jwt_token, cookies
+        try:
+            data = json_loads(self.cache_path.read_bytes())
+            expiry = datetime.fromisoformat(data['expiry'])
+            cookies = [Cookie(**cookie) for cookie in data['cookies']]
+            return expiry, data['userid'], data['jwt'], cookies
+        except (KeyError, TypeError, ValueError) as e:
+            raise SessionExpired(f'Found a cached session, but encountered an error loading it: {e!r}') from e
 
     async def _load_cached(self):
         if self.force_reauth:
             raise SessionExpired('Forced reauth')
         elif self.cache_path.exists():
-            expiry, userid, jwt_token, cookies = await get_running_loop().run_in_executor(None, self._read_cache_file)
+            expiry, userid, jwt_token, cookies = await to_thread(self._read_cache_file)
             if expiry.tzinfo:
                 expiry = expiry.astimezone(UTC).replace(tzinfo=None)
-            if expiry < datetime.utcnow() or any(cookie.expires < time.time() for cookie in cookies):
+            now = time.time()
+            if expiry.replace(tzinfo=UTC).timestamp() < now or any(cookie.expires < now for cookie in cookies):
                 raise SessionExpired('Found a cached session, but it expired')
 
             await self._register_session(expiry, userid, jwt_token, cookies)
-            log.debug(f'Loaded session for user={userid} with expiry={self._localize(expiry)}')
+            log.debug(f'Loaded session for user={userid} with expiry={self._localize(self._expiry_ts)}')
         else:
             raise SessionExpired('No cached session was found')
 
     async def _register_session(self, expiry: datetime, userid: str, jwt_token: str, cookies=None, save: bool = False):
         self.expiry = expiry
+        self._expiry_ts = expiry.replace(tzinfo=UTC).timestamp()  # expiry is a naive UTC datetime
         self._user_id = userid
         session = await self._client.get_session()
         session.headers['Authorization'] = f'Basic {jwt_token}'
         if cookies is not None:
+            set_cookie = session.cookies.jar.set_cookie
             for cookie in cookies:
-                session.cookies.jar.set_cookie(cookie)
+                set_cookie(cookie)
 
         if save:
-            self._save_session(expiry, userid, jwt_token, list(session.cookies.jar))
-            # loop = get_running_loop()
-            # await loop.run_in_executor(None, self._save_session, expiry, userid, jwt_token, list(session.cookies.jar))
+            await to_thread(self._save_session, expiry, userid, jwt_token, list(session.cookies.jar))
 
     def _save_session(self, expiry: datetime, userid: str, jwt_token: str, cookies):
         if not self.cache_path.parent.exists():
             self.cache_path.parent.mkdir(parents=True)
         log.debug(f'Saving session info in cache: {self.cache_path}')
-        with self.cache_path.open('wb') as f:
-            pickle.dump((expiry, userid, jwt_token, cookies), f)
+        data = {
+            'expiry': expiry.isoformat(),
+            'userid': userid,
+            'jwt': jwt_token,
+            'cookies': [_cookie_to_dict(cookie) for cookie in cookies],
+        }
+        self.cache_path.write_text(json.dumps(data), encoding='utf-8')
 
     async def _get_oauth_token(self) -> str:
         headers = {
@@ -418,12 +483,13 @@ class NestWebAuth:
             'ss_domain': [NEST_URL],
         }
         session = await self._client.get_session()
-        resp = (await session.get(OAUTH_URL, params=params, headers=headers)).json()
-        resp_str = json.dumps(resp, indent=4, sort_keys=True)
-        log.log(9, f'Received OAuth response: {resp_str}')
+        resp = _loads(await session.get(OAUTH_URL, params=params, headers=headers))
+        if log.isEnabledFor(9):
+            log.log(9, f'Received OAuth response: {json.dumps(resp, indent=4, sort_keys=True)}')
         try:
             return resp['access_token']
         except KeyError as e:
+            resp_str = json.dumps(resp, indent=4, sort_keys=True)
             raise RuntimeError(f'No access_token was found in the oauth response: {resp_str}') from e
 
     async def _login_via_google(self):
@@ -436,12 +502,13 @@ class NestWebAuth:
             'policy_id': 'authproxy-oauth-policy',
         }
         session = await self._client.get_session()
-        resp = (await session.post(JWT_URL, params=params, headers=headers)).json()
-        log.log(9, f'Initialized session; response: {json.dumps(resp, indent=4, sort_keys=True)}')
+        resp = _loads(await session.post(JWT_URL, params=params, headers=headers))
+        if log.isEnabledFor(9):
+            log.log(9, f'Initialized session; response: {json.dumps(resp, indent=4, sort_keys=True)}')
         claims = resp['claims']
         expiry = _parse_datetime(claims['expirationTime'])
         await self._register_session(expiry, claims['subject']['nestId']['id'], resp['jwt'], save=True)
-        log.debug(f'Initialized session for user={self._user_id!r} with expiry={self._localize(expiry)}')
+        log.debug(f'Initialized session for user={self._user_id!r} with expiry={self._localize(self._expiry_ts)}')
 
     async def __aenter__(self):
         await self._lock.acquire()
@@ -450,16 +517,34 @@ class NestWebAuth:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         self._lock.release()
 
-    def _localize(self, expiry: datetime) -> str:
-        return expiry.replace(tzinfo=UTC).astimezone(self.config.time_zone).strftime('%Y-%m-%d %H:%M:%S %Z')
+    def _localize(self, expiry_ts: float) -> str:
+        return datetime.fromtimestamp(expiry_ts, self.config.time_zone).strftime('%Y-%m-%d %H:%M:%S %Z')
+
+
+def _loads(resp: Response) -> Any:
+    # Equivalent to resp.json(), but uses orjson (if available) directly on the raw response content
+    return json_loads(resp.content)
 
 
-def _expand_with_children(types: Iterable[str]) -> set[str]:
-    types = set(types)
-    for p_type in tuple(types):
+def _cookie_to_dict(cookie: Cookie) -> dict[str, Any]:
+    # The keys match Cookie.__init__'s params, so Cookie(**cookie_dict) restores it
+    cookie_dict = {attr: getattr(cookie, attr) for attr in _COOKIE_ATTRS}
+    cookie_dict['rest'] = cookie._rest  # noqa
+    return cookie_dict
+
+
+def _expand_with_children(types: Iterable[str]) -> frozenset[str]:
+    return _expand_types_with_children(frozenset(types))  # frozenset() returns frozenset args as-is
+
+
+@lru_cache(maxsize=64)
+def _expand_types_with_children(types: frozenset[str]) -> frozenset[str]:
+    # NestObject subclasses are all registered at import time, so the expansion for a given set of types never changes
+    expanded = set(types)
+    for p_type in types:
         if cls := NestObject._type_cls_map.get(p_type):
-            types.update(cls.fetch_child_types)
-    return types
+            expanded.update(cls.fetch_child_types)
+    return frozenset(expanded)
 
 
 def _type_not_found_description(obj_type: str, sub_type_key: str) -> str:
@@ -473,9 +558,12 @@ def _type_not_found_description(obj_type: str, sub_type_key: str) -> str:
 
 
 def _parse_datetime(dt_str: str) -> datetime:
-    for dt_format in ('%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%SZ'):
-        try:
-            return datetime.strptime(dt_str, dt_format)
-        except ValueError:
-            pass
-    raise ValueError(f'Could not parse {dt_str=} using any configured datetime format')
+    if dt_str.endswith('Z'):
+        # Before 3.11, fromisoformat rejects fractional seconds that are not 3 or 6 digits; strptime handles the rest
+        with suppress(ValueError):
+            return datetime.fromisoformat(dt_str[:-1])
+    dt_format = '%Y-%m-%dT%H:%M:%S.%fZ' if '.' in dt_str else '%Y-%m-%dT%H:%M:%SZ'
+    try:
+        return datetime.strptime(dt_str, dt_format)
+    except ValueError as e:
+        raise ValueError(f'Could not parse {dt_str=} using {dt_format=}') from e
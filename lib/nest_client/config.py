@@ -12,7 +12,7 @@ from functools import cached_property
 from importlib import resources
 from pathlib import Path
 from typing import Optional, Mapping
-from zoneinfo import ZoneInfo, available_timezones
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
 
 __all__ = ['NestConfig', 'DEFAULT_CONFIG_PATH', 'CONFIG_ITEMS']
 log = logging.getLogger(__name__)
@@ -62,10 +62,7 @@ class NestConfig:
         required: bool = False,
     ) -> Optional[str]:
         name = name or key
-        try:
-            cfg_value = self._data.get(section, key)
-        except (NoSectionError, NoOptionError):
-            cfg_value = None
+        cfg_value = self._data.get(section, key, fallback=None)
         if required and not cfg_value and not new_value:
             try:
                 new_value = input(f'Please enter your Nest {name}: ').strip()
@@ -104,16 +101,16 @@ class NestConfig:
     def serial(self) -> Optional[str]:
         return self.get('device', 'serial', 'thermostat serial number', self._overrides.get('serial'))
 
-    @property
-    def oauth_cookie(self):
+    @cached_property
+    def oauth_cookie(self) -> str:
         return self.get('oauth', 'cookie', 'OAuth Cookie', required=True)
 
-    @property
-    def oauth_login_hint(self):
+    @cached_property
+    def oauth_login_hint(self) -> str:
         return self.get('oauth', 'login_hint', 'OAuth login_hint', required=True)
 
-    @property
-    def oauth_client_id(self):
+    @cached_property
+    def oauth_client_id(self) -> str:
         return self.get('oauth', 'client_id', 'OAuth client_id', required=True)
 
     @cached_property
@@ -146,11 +143,7 @@ class NestConfig:
         except KeyError as e:
             keys = ', '.join(sorted(key_name_map))
             raise ValueError(f'Invalid [{section}] {key=} - choose one of: {keys}') from e
-        try:
-            old = self._data.get(section, key)
-        except (NoSectionError, NoOptionError):
-            old = None
-        else:
+        if (old := self._data.get(section, key, fallback=None)) is not None:
             self.delete(section, key)
 
         try:
@@ -162,6 +155,8 @@ class NestConfig:
                 self._overrides['temp_unit'] = value
                 new_val = self.temp_unit
             else:
+                if section == 'oauth':
+                    self.__dict__.pop(f'oauth_{key}', None)
                 new_val = self.get(section, key, name, value, save=True)
         except Exception:
             if old is not None:
@@ -183,7 +178,11 @@ def get_local_tz_name() -> str:
     now = datetime.now().astimezone()  # local non-IANA DB TZ
     offset, tz_name = now.tzinfo.utcoffset(now), now.tzinfo.tzname(now)
     tz_name = ''.join(part[0] for part in tz_name.split()) if ' ' in tz_name else tz_name
-    zones = (ZoneInfo(tz) for tz in available_timezones() if '/' in tz and not tz.startswith(('Etc/', 'US/')))
+    if key := _get_system_tz_key():
+        tz = ZoneInfo(key)
+        if offset == tz.utcoffset(now) and tz_name == tz.tzname(now):
+            return key
+    zones = (ZoneInfo(tz) for tz in available_timezones() if _is_candidate_tz_key(tz))
     candidates = {tz.key for tz in zones if offset == tz.utcoffset(now) and tz_name == tz.tzname(now)}
     if not candidates:
         return tz_name
@@ -193,3 +192,30 @@ def get_local_tz_name() -> str:
         zones = resources.open_text('tzdata', 'zones').read().splitlines()  # most common aliases seem to be first
         filtered = [tz for tz in zones if tz in candidates]
         return filtered[0]
+
+
+def _is_candidate_tz_key(key: str) -> bool:
+    return '/' in key and not key.startswith(('Etc/', 'US/'))
+
+
+def _get_system_tz_key() -> Optional[str]:
+    """The IANA key named by $TZ or the /etc/localtime symlink, if any - avoids scanning every available zone"""
+    tz = os.environ.get('TZ')
+    if tz and not tz.startswith('/'):
+        key = tz[1:] if tz.startswith(':') else tz
+    else:
+        try:
+            parts = Path(tz or '/etc/localtime').resolve(strict=True).parts
+        except OSError:
+            return None
+        if 'zoneinfo' not in parts:
+            return None
+        key = '/'.join(parts[len(parts) - parts[::-1].index('zoneinfo'):])
+    if key.startswith(('posix/', 'right/')):  # Alternate copies of the same zones in the system tz database
+        key = key.split('/', 1)[1]
+    if key.startswith('/') or not _is_candidate_tz_key(key):
+        return None
+    try:
+        return ZoneInfo(key).key
+    except (ValueError, ZoneInfoNotFoundError):
+        return None
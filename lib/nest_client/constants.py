@@ -15,6 +15,9 @@ OAUTH_URL = 'https://accounts.google.com/o/oauth2/iframerpc'
 
 TARGET_TEMP_TYPES = {'cool', 'heat', 'range', 'off'}
 
+# Defined here so that the CLI parser can use it without importing nest_client.output
+PRINTER_FORMATS = ('json', 'json-compact', 'json-pretty', 'json-lines', 'yaml', 'pprint', 'table', 'plain')
+
 NEST_WHERE_MAP = {
     '00000000-0000-0000-0000-000100000000': 'Entryway',
     '00000000-0000-0000-0000-000100000001': 'Basement',
@@ -120,4 +123,6 @@ ALL_BUCKET_TYPES = [
     'widget_track'
 ]
 
-INIT_BUCKET_TYPES = {'buckets', 'device', 'message', 'schedule', 'shared', 'structure', 'user', 'user_settings'}
+INIT_BUCKET_TYPES = frozenset(
+    {'buckets', 'device', 'message', 'schedule', 'shared', 'structure', 'user', 'user_settings'}
+)
@@ -5,9 +5,12 @@ Classes that represent Nest Structures, Users, Devices/Thermostats, etc.
 """
 
 import logging
-from datetime import datetime
-from threading import RLock
+import time
+from functools import lru_cache
+from operator import attrgetter
+from sys import intern
 from typing import TYPE_CHECKING, Any, Union, Optional, TypeVar, Type, Callable
+from weakref import WeakValueDictionary
 
 from ..constants import BUCKET_CHILD_TYPES
 from ..exceptions import NestObjectNotFound, DictAttrFieldNotFoundError
@@ -26,12 +29,17 @@ _NotSet = object()
 
 
 class NestObject(ClearableCachedPropertyMixin):
-    __lock = RLock()
-    __instances = {}
+    # __dict__ is inherited from the mixin, and is still needed for cached properties; type and parent_type have
+    # class-level defaults, so they cannot be slots
+    __slots__ = (
+        'key', 'serial', 'timestamp', 'revision', 'value', 'client', 'config', '_refreshed', '_needs_update'
+    )
+    __instances: WeakValueDictionary[str, 'NestObject'] = WeakValueDictionary()  # Clients hold the strong refs
     type: Optional[str] = None
     parent_type: Optional[str] = None
     child_types: Optional[dict[str, bool]] = None
     sub_type_key: Optional[str] = None
+    _initialized: bool = False
     _type_cls_map: dict[str, Type[NestObj]] = {}
     _sub_type_cls_map: dict[str, dict[str, Type[NestObj]]] = {}
 
@@ -54,16 +62,14 @@ class NestObject(ClearableCachedPropertyMixin):
             bucket_type = key.split('.', 1)[0]
             cls = cls._type_cls_map.get(bucket_type, cls)
         if key_sub_cls_map := cls._sub_type_cls_map.get(cls.type):
-            for key, sub_cls in key_sub_cls_map.items():
-                if key in value:
+            for sub_key, sub_cls in key_sub_cls_map.items():
+                if sub_key in value:
                     cls = sub_cls
                     break
-        with NestObject.__lock:
-            try:
-                return NestObject.__instances[key]
-            except KeyError:
-                NestObject.__instances[key] = obj = super().__new__(cls)
-                return obj
+        if (obj := NestObject.__instances.get(key)) is None:
+            # setdefault keeps any instance registered in the meantime instead of replacing it
+            obj = NestObject.__instances.setdefault(key, super().__new__(cls))
+        return obj
 
     def __init__(
         self,
@@ -73,27 +79,22 @@ class NestObject(ClearableCachedPropertyMixin):
         value: dict[str, Any],
         client: 'NestWebClient',
     ):
-        if hasattr(self, 'key'):
+        if self._initialized:  # Instances are registered by key, so key-derived attributes are already set
             self.clear_cached_properties()
-        self.key = key
-        self.type, self.serial = key.split('.', 1)
-        if self.parent_type is None and self.type != self.__class__.type:
-            if '-' in self.serial:
-                self.parent_type = 'structure'
-            else:
-                try:
-                    int(self.serial)
-                except ValueError:
-                    self.parent_type = 'device'
-                else:
-                    self.parent_type = 'user'
+        else:
+            self._initialized = True
+            self.key = key
+            obj_type, self.serial = key.split('.', 1)
+            self.type = intern(obj_type)  # One shared str per type instead of a new one for each object
+            if self.parent_type is None and self.type != self.__class__.type:
+                self.parent_type = _parent_type_for_serial(self.serial)
 
         self.timestamp = timestamp
         self.revision = revision
         self.value = value
         self.client = client
         self.config = client.config
-        self._refreshed = datetime.now()
+        self._refreshed = time.monotonic()
         self._needs_update = False
 
     def __repr__(self) -> str:
@@ -137,7 +138,7 @@ class NestObject(ClearableCachedPropertyMixin):
     # region Refresh Status Methods
 
     def needs_refresh(self, interval: float) -> bool:
-        return self._needs_update or (datetime.now() - self._refreshed).total_seconds() >= interval
+        return self._needs_update or time.monotonic() - self._refreshed >= interval
 
     def subscribe_dict(self, meta: bool = True) -> dict[str, Union[str, int, None]]:
         if meta:
@@ -172,7 +173,7 @@ class NestObject(ClearableCachedPropertyMixin):
         self.revision = obj_dict['object_revision']
         self.timestamp = obj_dict['object_timestamp']
         self.value = obj_dict['value']
-        self._refreshed = datetime.now()
+        self._refreshed = time.monotonic()
         self._needs_update = False
 
     async def _subscribe(self, send_meta: bool = False):
@@ -191,7 +192,6 @@ class NestObject(ClearableCachedPropertyMixin):
         self._needs_update = True
         async with self.client.transport_url() as client:
             log.debug(f'Submitting {payload=}')
-            self.clear_cached_properties()
             return await client.post('v5/put', json=payload)
 
     # region Parent/Child Object Methods
@@ -212,7 +212,8 @@ class NestObject(ClearableCachedPropertyMixin):
         """Mapping of {type: NestObject} for this object's children"""
         if fetch_child_types := self.fetch_child_types:
             key_obj_map = await self.client.get_objects(fetch_child_types)
-            return {obj.type: obj for obj in key_obj_map.values() if obj.serial == self.serial}
+            serial = self.serial
+            return {t: obj for t in fetch_child_types if (obj := key_obj_map.get(f'{t}.{serial}')) is not None}
         return {}
 
     async def get_parent(self) -> Optional[NestObj]:
@@ -227,6 +228,11 @@ class NestObject(ClearableCachedPropertyMixin):
 
 
 class NestProperty(ClearableCachedProperty):
+    __slots__ = (
+        'path', '_key', 'path_repr', 'attr', '_attr_get', 'type', 'name', 'default', 'default_factory', '_can_cache',
+        '__doc__',
+    )
+
     def __init__(
         self,
         path: str,
@@ -260,15 +266,19 @@ class NestProperty(ClearableCachedProperty):
           NestProperty should reference
         """
         self.path = [p for p in path.split(delim) if p]
+        self._key = self.path[0] if len(self.path) == 1 else None  # Most properties are a single top-level key
         self.path_repr = delim.join(self.path)
         self.attr = attr
+        self._attr_get = attrgetter(attr)
         self.type = type
         self.name = f'_{self.__class__.__name__}#{self.path_repr}'
         self.default = default
         self.default_factory = default_factory
+        self._can_cache = False  # Values can only be cached after a name is assigned via __set_name__
 
     def __set_name__(self, owner, name):
         self.name = name
+        self._can_cache = True
         attr_path = ''.join('[{!r}]'.format(p) for p in self.path)
         self.__doc__ = (
             f'A :class:`NestProperty<nest.entities.base.NestProperty>` that references this {owner.__name__}'
@@ -283,23 +293,28 @@ class NestProperty(ClearableCachedProperty):
         # if obj._needs_update:
         #     await obj.refresh()
 
-        value = getattr(obj, self.attr)
-        for key in self.path:
-            try:
+        value = self._attr_get(obj)
+        try:
+            if (key := self._key) is not None:
                 value = value[key]
-            except KeyError:
-                if self.default is not _NotSet:
-                    value = self.default
-                    break
-                elif self.default_factory is not _NotSet:
-                    value = self.default_factory()
-                    break
+            else:
+                for key in self.path:
+                    value = value[key]
+        except (KeyError, TypeError):  # TypeError: an intermediate value was not a dict
+            value = _NotSet
+
+        if value is _NotSet:
+            if self.default is not _NotSet:
+                value = self.default
+            elif self.default_factory is not _NotSet:
+                value = self.default_factory()
+            else:
                 raise DictAttrFieldNotFoundError(obj, self.name, self.attr, self.path_repr)
 
         if self.type is not _NotSet:
             # noinspection PyArgumentList
             value = self.type(value)
-        if '#' not in self.name:
+        if self._can_cache:
             obj.__dict__[self.name] = value
         return value
 
@@ -310,6 +325,8 @@ class NestProperty(ClearableCachedProperty):
 
 
 class TemperatureProperty(NestProperty):
+    __slots__ = ('__doc__',)  # The class-level __doc__ would otherwise shadow the inherited slot
+
     def __get__(self, obj: 'NestObject', cls):
         if obj is None:
             return self
@@ -317,3 +334,15 @@ class TemperatureProperty(NestProperty):
         if obj.client.config.temp_unit == 'f':
             return celsius_to_fahrenheit(value_c)
         return value_c
+
+
+@lru_cache(maxsize=64)
+def _parent_type_for_serial(serial: str) -> str:
+    if '-' in serial:
+        return 'structure'
+    try:
+        int(serial)
+    except ValueError:
+        return 'device'
+    else:
+        return 'user'
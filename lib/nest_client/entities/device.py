@@ -6,6 +6,7 @@ Classes that represent Nest Devices/Thermostats and related information.
 
 import logging
 import time
+from asyncio import sleep
 from functools import cached_property
 from typing import TYPE_CHECKING, Any, Optional, Union
 
@@ -53,8 +54,7 @@ class Device(NestObject, type='device', parent_type=None):
 
     @cached_property
     def description(self) -> str:
-        name, where = self.name, self.where
-        return f'{name} - {where}' if name and where else name if name else where if where else ''
+        return ' - '.join(part for part in (self.name, self.where) if part)
 
 
 class ThermostatDevice(Device, type='device', parent_type=None, key='hvac_wires'):
@@ -73,11 +73,21 @@ class ThermostatDevice(Device, type='device', parent_type=None, key='hvac_wires'
 
     @cached_property
     def has(self) -> dict[str, bool]:
-        return {k[4:]: v for k, v in self.value.items() if k.startswith('has_')}
+        return self._has_and_fan[0]
 
     @cached_property
     def fan(self) -> dict[str, Union[str, bool, int]]:
-        return {k[4:]: v for k, v in self.value.items() if k.startswith('fan_')}
+        return self._has_and_fan[1]
+
+    @cached_property
+    def _has_and_fan(self) -> tuple[dict[str, bool], dict[str, Union[str, bool, int]]]:
+        has, fan = {}, {}  # Both are populated in a single pass over the (large) device bucket
+        for key, val in self.value.items():
+            if (prefix := key[:4]) == 'has_':
+                has[key[4:]] = val
+            elif prefix == 'fan_':
+                fan[key[4:]] = val
+        return has, fan
 
     async def start_fan(self, duration: int = 1800) -> 'Response':
         """
@@ -169,14 +179,14 @@ class Shared(NestObject, type='shared', parent_type='device'):
             if current > temp and delta < 0.5:
                 tmp = current - 0.6
                 await self.set_temp(tmp, True, False)
-                time.sleep(3)
+                await sleep(3)
         elif mode == 'HEAT':
             delta = temp - current
             log.debug(f'{current=} {temp=} {delta=} {fahrenheit=}')
             if current < temp and delta < 0.5:
                 tmp = current + 0.6
                 await self.set_temp(tmp, True, False)
-                time.sleep(3)
+                await sleep(3)
         else:
             log.log(19, f'Unable to force unit to run for {mode=!r}')
         return await self.set_temp(temp, convert=False)
@@ -10,7 +10,7 @@ import logging
 import time
 from bisect import bisect_left
 from dataclasses import dataclass, field, fields, asdict, InitVar
-from functools import cached_property
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Union, Iterator, Iterable, Optional
 
@@ -442,7 +442,12 @@ class ScheduleEntry:
 
 
 def secs_to_wall(seconds: int) -> str:
-    hour, minute = divmod(seconds // 60, 60)
+    return _minutes_to_wall(seconds // 60)  # Keyed by minute so that any second within a minute shares an entry
+
+
+@lru_cache(maxsize=1440)  # One entry per minute of the day
+def _minutes_to_wall(minutes: int) -> str:
+    hour, minute = divmod(minutes, 60)
     return f'{hour:02d}:{minute:02d}'
 
 
@@ -40,27 +40,26 @@ class Structure(NestObject, type='structure', parent_type=None):
         return await self.client.get_user(self.value['user'])
 
     async def get_swarm(self) -> dict[str, 'Device']:
-        dev_keys = set(self.value['swarm'])
-        devices = await self.client.get_devices()
-        return {dev_key: dev for dev_key, dev in devices.items() if dev_key in dev_keys}
+        return self._select_devices(self.value['swarm'], await self.client.get_devices())
 
     async def get_devices(self) -> dict[str, 'Device']:
-        dev_keys = set(self.value['devices'])
-        devices = await self.client.get_devices()
-        return {dev_key: dev for dev_key, dev in devices.items() if dev_key in dev_keys}
+        return self._select_devices(self.value['devices'], await self.client.get_devices())
 
     async def devices_and_shared(self) -> dict[str, tuple['Device', Optional['Shared']]]:
-        dev_keys = set(self.value['devices'])
-        devices = await self.client.get_devices()
-        filtered = [dev for dev_key, dev in devices.items() if dev_key in dev_keys]
+        filtered = (await self.get_devices()).values()
         dev_shared_tuples = await gather(*(dev.dev_shared_tuple() for dev in filtered))
-        return {dev.key: (dev, shared) for dev, shared in dev_shared_tuples}
+        return {dev.key: dev_shared for dev, dev_shared in zip(filtered, dev_shared_tuples)}
 
-    async def get_thermostats(self) -> tuple['ThermostatDevice']:
+    @staticmethod
+    def _select_devices(dev_keys: list[str], devices: dict[str, 'Device']) -> dict[str, 'Device']:
+        # Look up this structure's few device keys rather than scanning every device known by the client
+        return {dev_key: dev for dev_key in dev_keys if (dev := devices.get(dev_key)) is not None}
+
+    async def get_thermostats(self) -> tuple['ThermostatDevice', ...]:
         devices = await self.get_devices()
         return tuple(dev for dev in devices.values() if isinstance(dev, ThermostatDevice))
 
-    async def thermostats_and_shared(self) -> tuple[tuple['ThermostatDevice', Optional['Shared']]]:
+    async def thermostats_and_shared(self) -> tuple[tuple['ThermostatDevice', Optional['Shared']], ...]:
         devices_and_shared = await self.devices_and_shared()
         return tuple((dev, shared) for dev, shared in devices_and_shared.values() if isinstance(dev, ThermostatDevice))
 
@@ -5,7 +5,8 @@ Classes that represent Nest Structures, Users, Devices/Thermostats, etc.
 """
 
 import logging
-from collections import defaultdict
+from functools import cached_property
+from sys import intern
 from typing import TYPE_CHECKING, Any, Union
 
 from .base import NestObject, NestProperty
@@ -39,11 +40,21 @@ class Messages(NestObject, type='message_center', parent_type='user'):
 
 
 class Buckets(NestObject, type='buckets', parent_type='user'):
+    @cached_property
+    def _bucket_types_and_serials(self) -> list[tuple[str, str]]:
+        # Cleared with the other cached properties when this object is refreshed
+        types_and_serials = []
+        for bucket in self.value['buckets']:
+            bucket_type, _, serial = bucket.partition('.')
+            types_and_serials.append((intern(bucket_type), serial))  # Only a handful of distinct types
+        return types_and_serials
+
     async def types_by_parent(self) -> dict[NestObject, set[str]]:
         parent_objs = await self.client.get_init_parent_objects()
-        types = defaultdict(set)
-        for bucket in self.value['buckets']:
-            bucket_type, serial = bucket.split('.', 1)
+        types: dict[NestObject, set[str]] = {}
+        for bucket_type, serial in self._bucket_types_and_serials:
             parent = parent_objs[serial]
-            types[parent].add(bucket_type)
+            if (parent_types := types.get(parent)) is None:
+                types[parent] = parent_types = set()
+            parent_types.add(bucket_type)
         return types
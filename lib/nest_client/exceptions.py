@@ -38,9 +38,14 @@ class ConfigError(NestException):
     def __init__(self, config: 'NestConfig', message: str):
         self.config = config
         self.message = message
+        self.env = dict(environ)  # Snapshot, in case the environment changes before this is reported
 
     def __str__(self) -> str:
-        return f'{self.__class__.__name__}: {self.message} in {self.config.path.as_posix()}\nenv: {environ}'
+        return f'{self.__class__.__name__}: {self.message} in {self.config.path.as_posix()}'
+
+    def debug_str(self) -> str:
+        """The error message, followed by the environment variables at the time that this error was raised"""
+        return f'{self}\nenv: {self.env}'
 
 
 class TimeNotFound(NestException):
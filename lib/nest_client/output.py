@@ -29,10 +29,11 @@ try:
 except ImportError:
     wcswidth = len
 
+from .constants import PRINTER_FORMATS
 from .exceptions import TableFormatException
 from .utils import ClearableCachedPropertyMixin
 
-__all__ = ['Column', 'SimpleColumn', 'Table', 'TableBar', 'HeaderRow', 'colored', 'Printer', 'cdiff']
+__all__ = ['Column', 'SimpleColumn', 'Table', 'TableBar', 'HeaderRow', 'colored', 'Printer', 'cdiff', 'cdiff_text']
 log = logging.getLogger(__name__)
 
 ANSI_COLOR_RX = re.compile(r'(\033\[\d+;?\d*;?\d*m)(.*)(\033\[\d+;?\d*;?\d*m)')
@@ -52,6 +53,12 @@ def cdiff(path1, path2, n: int = 3):
         _cdiff(f1.read().splitlines(), f2.read().splitlines(), path1, path2, n=n)
 
 
+def cdiff_text(path1, text2: str, name2: str = '', n: int = 3):
+    """Like :func:`cdiff`, but compares the given file to text that is already in memory"""
+    with open(path1, 'r', encoding='utf-8') as f1:
+        _cdiff(f1.read().splitlines(), text2.splitlines(), path1, name2, n=n)
+
+
 def _cdiff(a, b, name_a: str = '', name_b: str = '', n: int = 3):
     for i, line in enumerate(unified_diff(a, b, name_a, name_b, n=n, lineterm='')):
         if line.startswith('+') and i > 1:
@@ -514,7 +521,7 @@ class replacement_itemgetter:
 
 
 class Printer:
-    formats = ['json', 'json-compact', 'json-pretty', 'json-lines', 'yaml', 'pprint', 'table', 'plain']
+    formats = list(PRINTER_FORMATS)
 
     def __init__(self, output_format: str):
         if output_format is None or output_format in Printer.formats:
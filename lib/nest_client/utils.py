@@ -70,7 +70,7 @@ def get_user_temp_dir(*sub_dirs, mode: int = 0o777) -> Path:
 
 
 class ClearableCachedProperty(ABC):
-    pass
+    __slots__ = ()
 
 
 # noinspection PyUnresolvedReferences
@@ -102,6 +102,8 @@ class ClearableCachedPropertyMixin:
 
 
 class cached_classproperty:
+    __slots__ = ('__doc__', 'func', 'values')
+
     def __init__(self, func):
         self.__doc__ = func.__doc__
         if not isinstance(func, (classmethod, staticmethod)):
@@ -16,6 +16,7 @@ optional_dependencies = {
     ],
     'schedule': ['bitarray'],
     'output': ['wcswidth'],                             # Not required - will use len instead if missing
+    'fast_json': ['orjson'],                            # Not required - will use json instead if missing
 }
 optional_dependencies['ALL'] = sorted(set(chain.from_iterable(optional_dependencies.values())))
 